@@ -6,7 +6,8 @@ Contains all the widget representations used in the designer and specifies all t
 # ======================================================================= #
 
 import logging
-from collections import defaultdict
+import tkinter.ttk as ttk
+from collections import OrderedDict, defaultdict
 
 from hoverset.ui.icons import get_icon_image
 from hoverset.ui.widgets import ScrolledFrame, Frame, Label, Button
@@ -18,58 +19,112 @@ from studio.lib.pseudo import Container
 
 
 class ReusableStyleItem(StyleItem):
-    _pool = defaultdict(dict)
+    # reusable items keyed by (id(parent), name) in least recently used order
+    _pool = OrderedDict()
+    # pool keys held by each parent, items remove their own keys when destroyed along with the parent
+    _parent_keys = defaultdict(set)
+    # maximum number of pooled items per parent before least recently used ones are destroyed
+    _POOL_MAX = 128
 
     def __init__(self, parent, style_definition, on_change=None):
         super().__init__(parent, style_definition, on_change)
         self.parent = parent
         self.is_available = True
+        # visibility within the parent style group as set through StyleGroup._show and StyleGroup._hide
+        self._visible = True
+        # value last displayed by the editor, used to skip re-purposing with unchanged definitions
+        self._last_def_value = style_definition.get("value")
         # add self to reusable pool
-        ReusableStyleItem._pool[parent][style_definition.get("name")] = self
+        self._pool_key = key = (id(parent), style_definition.get("name"))
+        ReusableStyleItem._pool[key] = self
+        ReusableStyleItem._pool.move_to_end(key)
+        keys = ReusableStyleItem._parent_keys[key[0]]
+        keys.add(key)
+        if len(keys) > self._POOL_MAX:
+            self._evict(key[0])
         # Mark item as available/not available for reuse based on whether it's visible
         self.bind("<Unmap>", lambda e: self._make_available(True))
         self.bind("<Map>", lambda e: self._make_available(False))
 
+    def _same_definition(self, style_definition):
+        current = self.definition
+        if style_definition is current:
+            return True
+        if len(style_definition) != len(current):
+            return False
+        return all(current.get(key) == val for key, val in style_definition.items() if key != "value")
+
+    def _change(self, value):
+        self._last_def_value = value
+        super()._change(value)
+
+    def set(self, value):
+        self._last_def_value = value
+        super().set(value)
+
     def _re_purposed(self, style_definition, on_change=None):
         if on_change is not None:
             self._on_change = on_change
+        value = style_definition.get("value")
+        if value == self._last_def_value and self._same_definition(style_definition):
+            # editor already displays this exact definition, avoid triggering its observers
+            self.definition = style_definition
+            return self
         # block changes temporarily by setting on_change to None
         # this prevents glitching while resizing or unexpected race conditions
         temp = self._on_change
         self._on_change = None
+        self.definition = style_definition
         self.name = style_definition.get("name")
         # allow editor to adjust to the new definition
         self._editor.set_def(style_definition)
-        self._editor.set(style_definition.get("value"))
+        self._editor.set(value)
         self._editor.on_change(self._change)
         self._label.configure(text=style_definition.get("display_name"))
         self._on_change = temp
+        self._last_def_value = value
         return self
 
+    def _evict(self, parent_id):
+        # destroy the least recently used item of the parent not currently displayed by it
+        for (item_parent, name), item in self._pool.items():
+            if item is self or item_parent != parent_id:
+                continue
+            if item.is_available and item.parent.items.get(name) is not item:
+                item.destroy()
+                return
+
     def _make_available(self, flag: bool):
         self.is_available = flag
 
     def destroy(self):
-        pool = self._pool[self.parent]
-        if self in pool:
-            pool.pop(self)
+        # only remove the pool entry if it is still this item
+        key = self._pool_key
+        if self._pool.get(key) is self:
+            del self._pool[key]
+            keys = self._parent_keys.get(key[0])
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._parent_keys[key[0]]
         super().destroy()
 
     @classmethod
     def acquire(cls, parent, style_definition, on_change=None):
-        pool = cls._pool.get(parent)
-        if pool:
-            item = pool.get(style_definition.get("name"))
-            if item and item.is_available:
-                return item._re_purposed(style_definition, on_change)
-        item = ReusableStyleItem(parent, style_definition, on_change)
-        return item
+        key = (id(parent), style_definition["name"])
+        item = cls._pool.get(key)
+        if item is not None and item.is_available:
+            cls._pool.move_to_end(key)
+            return item._re_purposed(style_definition, on_change)
+        return ReusableStyleItem(parent, style_definition, on_change)
 
 
 class StyleGroup(CollapseFrame):
     """
     Main subdivision of the Style pane
     """
+    # options known to be rejected by tk when set to an empty string
+    _non_empty_props = ()
 
     def __init__(self, master, pane, **cnf):
         super().__init__(master)
@@ -80,6 +135,14 @@ class StyleGroup(CollapseFrame):
         self._prev_widget = None
         self._has_initialized = False  # Flag to mark whether Style Items have been created
         self.items = {}
+        # lowercase display names cached per item name for fast case insensitive search
+        self._search_index = {}
+        self._last_query = None
+        self._any_hidden = False
+        # definition keys from the last full rebuild, valid whenever can_optimize holds
+        self._def_keys = ()
+        # widget selected while the group was collapsed, style items are only built on expand
+        self._pending_widget = None
 
     @property
     def widget(self):
@@ -90,18 +153,23 @@ class StyleGroup(CollapseFrame):
 
     def add(self, style_item):
         self.items[style_item.name] = style_item
+        self._search_index[style_item.name] = (style_item, style_item.definition["display_name"].lower())
         self._show(style_item)
 
     def remove(self, style_item):
         if style_item.name in self.items:
             self.items.pop(style_item.name)
+        self._search_index.pop(style_item.name, None)
         self._hide(style_item)
 
-    def _show(self, item):
-        item.pack(fill="x", pady=1)
+    def _show(self, item, before=None):
+        item.pack(fill="x", pady=1, before=before)
+        item._visible = True
 
     def _hide(self, item):
         item.pack_forget()
+        item._visible = False
+        self._any_hidden = True
 
     def _get_prop(self, prop, widget):
         return widget.get_prop(prop)
@@ -109,25 +177,92 @@ class StyleGroup(CollapseFrame):
     def _set_prop(self, prop, value, widget):
         widget.configure(**{prop: value})
 
+    def expand(self, *_):
+        super().expand()
+        # the pending widget may have been deleted since, only build for the current selection
+        if self._pending_widget is not None and self._pending_widget is self.style_pane._current:
+            self.on_widget_change(self._pending_widget)
+
+    def _set_pending(self, widget):
+        # keep track of the widget so applying styles still targets it
+        self._widget = widget
+        self._pending_widget = widget
+
+    def _clear_pending(self):
+        self._pending_widget = None
+
     def on_widget_change(self, widget):
         self._widget = widget
+        self._pending_widget = None
         if widget is None:
             self.collapse()
             return
         definitions = self.get_definition()
         if self.can_optimize():
-            for prop in definitions:
-                self.items[prop]._re_purposed(definitions[prop])
+            items = self.items
+            for prop in self._def_keys:
+                items[prop]._re_purposed(definitions[prop])
+        elif self._has_initialized and self._partial_repurpose(definitions):
+            self._def_keys = tuple(definitions)
         else:
+            # every item is shown again after a rebuild so the active query has to be re-applied
+            query = self._last_query
             # this unmaps all style items returning them to the pool for reuse
             self.clear_children()
             self.items.clear()
-            add = self.add
-            list(map(lambda p: add(ReusableStyleItem.acquire(self, definitions[p], self.apply), ), definitions))
+            self._search_index.clear()
+            self._last_query = None
+            self._any_hidden = False
+            add, acquire, apply = self.add, ReusableStyleItem.acquire, self.apply
+            for definition in definitions.values():
+                add(acquire(self, definition, apply))
+            self._def_keys = tuple(definitions)
+            if query:
+                self.on_search_query(query)
 
         self._has_initialized = True
         self._prev_widget = widget
 
+    def _partial_repurpose(self, definitions):
+        """
+        Adjust the current style items to a new set of definitions by re-purposing
+        items for shared properties and only swapping out the difference
+        :param definitions: style definitions to display
+        :return: False if shared properties are ordered differently in which case a
+            full rebuild is required, True otherwise
+        """
+        items = self.items
+        if [name for name in definitions if name in items] != [name for name in items if name in definitions]:
+            return False
+        for name in [name for name in items if name not in definitions]:
+            self.remove(items[name])
+        acquire, apply = ReusableStyleItem.acquire, self.apply
+        # kept items retain their search visibility so new items have to honour the active query as well
+        query = self._last_query
+        ordered = []
+        # walk backwards so new items can be packed before the next visible item
+        following = None
+        for name in reversed(list(definitions)):
+            item = items.get(name)
+            if item is None:
+                item = acquire(self, definitions[name], apply)
+                if not query or query in item.definition["display_name"].lower():
+                    self._show(item, following)
+                else:
+                    self._hide(item)
+            else:
+                item._re_purposed(definitions[name])
+            if item._visible:
+                following = item
+            ordered.append(item)
+        items.clear()
+        self._search_index.clear()
+        for item in reversed(ordered):
+            items[item.name] = item
+            self._search_index[item.name] = (item, item.definition["display_name"].lower())
+        self._any_hidden = not all(item._visible for item in ordered)
+        return True
+
     def _apply_action(self, prop, value, widget, data):
         self.apply(prop, value, widget, True)
 
@@ -135,18 +270,22 @@ class StyleGroup(CollapseFrame):
         return {}
 
     def apply(self, prop, value, widget=None, silent=False):
+        current = self._widget
         is_external = widget is not None
-        widget = self.widget if widget is None else widget
+        widget = current if widget is None else widget
         if widget is None:
             return
+        if value == '' and self._rejects_empty(prop, widget):
+            # editors emit empty values transiently, no need for a round trip to tk just to fail
+            return
         try:
             prev_val = self._get_prop(prop, widget)
             data = self._get_action_data(widget, prop)
             self._set_prop(prop, value, widget)
             new_data = self._get_action_data(widget, prop)
             self.studio.widget_modified(widget, self.style_pane, None)
-            if is_external:
-                if widget == self.widget:
+            if is_external and self._pending_widget is None:
+                if widget is current:
                     self.items[prop].set_silently(value)
             if silent:
                 return
@@ -163,18 +302,39 @@ class StyleGroup(CollapseFrame):
         except Exception as e:
             # Empty string values are too common to be useful in logger debug
             if value != '':
-                logging.error(e)
-                logging.error(f"Could not set {self.__class__.__name__} {prop} as {value}", )
+                # lazy formatting so nothing is built unless the record is actually emitted
+                logging.error("Could not set %s %s as %r: %s", self.__class__.__name__, prop, value, e)
+
+    def _rejects_empty(self, prop, widget):
+        return prop in self._non_empty_props
 
     def get_definition(self):
         return {}
 
     def on_search_query(self, query):
-        for item in self.items.values():
-            if query in item.definition.get("display_name"):
-                self._show(item)
+        query = query.lower()
+        if query == self._last_query or not (query or self._any_hidden):
+            # nothing would change on screen
+            self._last_query = query
+            return
+        self._last_query = query
+        show, hide = self._show, self._hide
+        any_hidden = False
+        # walk backwards so re-shown items can be packed before the next visible item, preserving order
+        following = None
+        for item, name in reversed(list(self._search_index.values())):
+            visible = query in name
+            # only touch the geometry manager when visibility actually changes
+            if visible != item._visible:
+                if visible:
+                    show(item, following)
+                else:
+                    hide(item)
+            if visible:
+                following = item
             else:
-                self._hide(item)
+                any_hidden = True
+        self._any_hidden = any_hidden
 
     def on_search_clear(self):
         # Calling search query with empty query ensures all items are displayed
@@ -197,6 +357,12 @@ class IdentityGroup(StyleGroup):
 
 
 class AttributeGroup(StyleGroup):
+    # only applies to classic tk widgets, ttk widgets accept empty values for most options
+    _non_empty_props = (
+        "anchor", "borderwidth", "highlightthickness", "insertborderwidth", "insertofftime", "insertontime",
+        "insertwidth", "justify", "padx", "pady", "relief", "repeatdelay", "repeatinterval", "selectborderwidth",
+        "state",
+    )
 
     def __init__(self, master, pane, **cnf):
         super().__init__(master, pane, **cnf)
@@ -219,11 +385,16 @@ class AttributeGroup(StyleGroup):
             if self.widget in widget._children:
                 self.style_pane._layout_group.on_widget_change(self.widget)
 
+    def _rejects_empty(self, prop, widget):
+        return not isinstance(widget, ttk.Widget) and super()._rejects_empty(prop, widget)
+
     def can_optimize(self):
-        return self._widget.__class__ == self._prev_widget.__class__ and self._has_initialized
+        return self._widget.__class__ is self._prev_widget.__class__ and self._has_initialized
 
 
 class LayoutGroup(StyleGroup):
+    # place width and height are deliberately absent, an empty value restores the requested size
+    _non_empty_props = ("column", "columnspan", "ipadx", "ipady", "padx", "pady", "row", "rowspan", "x", "y")
 
     def __init__(self, master, pane, **cnf):
         super().__init__(master, pane, **cnf)
@@ -239,15 +410,21 @@ class LayoutGroup(StyleGroup):
 
     def on_widget_change(self, widget):
         super().on_widget_change(widget)
-        self._prev_layout = widget.layout.layout_strategy
-        if widget:
-            self.label = f"Layout ({widget.layout.layout_strategy.name})"
+        if widget is not None:
+            layout_strategy = widget.layout.layout_strategy
+            self._prev_layout = layout_strategy
+            self.label = f"Layout ({layout_strategy.name})"
         else:
+            self._prev_layout = None
             self.label = "Layout"
 
+    def _set_pending(self, widget):
+        super()._set_pending(widget)
+        self.label = f"Layout ({widget.layout.layout_strategy.name})"
+
     def can_optimize(self):
         layout_strategy = self.widget.layout.layout_strategy
-        return layout_strategy.__class__ == self._prev_layout.__class__ \
+        return layout_strategy.__class__ is self._prev_layout.__class__ \
             and self._layout_equal(self.widget, self._prev_widget)
 
     def get_definition(self):
@@ -274,7 +451,10 @@ class StylePane(BaseFeature):
         self.body = ScrolledFrame(self, **self.style.surface)
         self.body.pack(side="top", fill="both", expand=True)
 
-        self._toggle_btn = Button(self._header, image=get_icon_image("chevron_down", 15, 15), **self.style.button,
+        # toggle icons are swapped on every expand/collapse so load them once
+        self._icon_chev_up = get_icon_image("chevron_up", 15, 15)
+        self._icon_chev_down = get_icon_image("chevron_down", 15, 15)
+        self._toggle_btn = Button(self._header, image=self._icon_chev_down, **self.style.button,
                                   width=25,
                                   height=25)
         self._toggle_btn.pack(side="right")
@@ -292,9 +472,12 @@ class StylePane(BaseFeature):
         self._attribute_group = self.add_group(AttributeGroup)
 
         self._empty_frame = Frame(self.body)
+        self._empty_label = Label(self._empty_frame, **self.style.text_passive)
+        self._empty_label.place(x=0, y=0, relheight=1, relwidth=1)
         self.show_empty()
         self._current = None
         self._expanded = False
+        self._search_job = None
 
     def create_menu(self):
         return (
@@ -324,30 +507,36 @@ class StylePane(BaseFeature):
         group.pack(side='top', fill='x', pady=4)
         return group
 
-    def show_empty(self):
-        self.remove_empty()
+    def _show_overlay(self, text):
+        # reuse a single label instead of creating one each time the overlay is shown
+        self._empty_label.config(text=text)
         self._empty_frame.place(x=0, y=0, relheight=1, relwidth=1)
-        Label(self._empty_frame, text="You have not selected any item",
-              **self.style.text_passive).place(x=0, y=0, relheight=1, relwidth=1)
+        self._empty_frame.lift()
+
+    def show_empty(self):
+        self._show_overlay("You have not selected any item")
 
     def remove_empty(self):
-        self._empty_frame.clear_children()
         self._empty_frame.place_forget()
 
     def show_loading(self):
-        self.remove_empty()
-        self._empty_frame.place(x=0, y=0, relheight=1, relwidth=1)
-        Label(self._empty_frame, text="Loading...",
-              **self.style.text_passive).place(x=0, y=0, relheight=1, relwidth=1)
+        self._show_overlay("Loading...")
 
     def styles_for(self, widget):
         self._current = widget
         if widget is None:
+            for group in self.groups:
+                group._clear_pending()
             self.show_empty()
             return
         self.show_loading()
-        for group in self.groups:
-            group.on_widget_change(widget)
+        groups = self.groups
+        for group in groups:
+            if group.is_expanded:
+                group.on_widget_change(widget)
+            else:
+                # collapsed groups are populated once they are expanded
+                group._set_pending(widget)
         self.remove_empty()
         self.body.update_idletasks()
 
@@ -355,6 +544,9 @@ class StylePane(BaseFeature):
         self._layout_group.on_widget_change(widget)
 
     def on_select(self, widget):
+        # selection may be re-fired for the same widget, there is nothing new to display then
+        if widget is self._current and widget is not None:
+            return
         self.styles_for(widget)
 
     def on_widget_change(self, old_widget, new_widget=None):
@@ -369,7 +561,7 @@ class StylePane(BaseFeature):
         for group in self.groups:
             group.expand()
         self._expanded = True
-        self._toggle_btn.config(image=get_icon_image("chevron_up", 15, 15))
+        self._toggle_btn.config(image=self._icon_chev_up)
 
     def clear_all(self):
         for group in self.groups:
@@ -379,7 +571,7 @@ class StylePane(BaseFeature):
         for group in self.groups:
             group.collapse()
         self._expanded = False
-        self._toggle_btn.config(image=get_icon_image("chevron_down", 15, 15))
+        self._toggle_btn.config(image=self._icon_chev_down)
 
     def _toggle(self, *_):
         if not self._expanded:
@@ -396,13 +588,31 @@ class StylePane(BaseFeature):
             super().start_search()
             self.body.scroll_to_start()
 
+    def _cancel_search(self):
+        if self._search_job is not None:
+            self.after_cancel(self._search_job)
+            self._search_job = None
+
     def on_search_query(self, query):
+        # debounce so the filter only runs once the user pauses typing
+        self._cancel_search()
+        self._search_job = self.after(80, self._do_search, query)
+
+    def _do_search(self, query):
+        self._search_job = None
         for group in self.groups:
             group.on_search_query(query)
         self.__update_frames()
 
     def on_search_clear(self):
+        # drop any pending filter so it does not run after the search is cleared
+        self._cancel_search()
         for group in self.groups:
             group.on_search_clear()
         # The search bar is being closed and we need to bring everything back
         super().on_search_clear()
+
+    def destroy(self):
+        # a pending filter would otherwise fire into a deleted tcl command
+        self._cancel_search()
+        super().destroy()
@@ -0,0 +1,73 @@
+import unittest
+from studio.tests.support import TestStudioApp
+from studio.feature.stylepane import StyleGroup, LayoutGroup, ReusableStyleItem
+
+
+def text_definition(name, display_name):
+    return {
+        "display_name": display_name,
+        "type": "text",
+        "name": name,
+        "value": "",
+    }
+
+
+class StyleGroupTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.studio = TestStudioApp.get_instance()
+        cls.pane = cls.studio.style_pane
+
+    def setUp(self) -> None:
+        self.group = StyleGroup(self.pane.body.body, self.pane)
+
+    def tearDown(self) -> None:
+        self.group.destroy()
+
+    def test_search_query_case_insensitive(self):
+        background = ReusableStyleItem.acquire(self.group, text_definition("background", "Background"))
+        foreground = ReusableStyleItem.acquire(self.group, text_definition("foreground", "foreground"))
+        self.group.add(background)
+        self.group.add(foreground)
+        self.group.on_search_query("BACK")
+        self.assertEqual(background.winfo_manager(), "pack")
+        self.assertEqual(foreground.winfo_manager(), "")
+        self.group.on_search_query("Ground")
+        self.assertEqual(background.winfo_manager(), "pack")
+        self.assertEqual(foreground.winfo_manager(), "pack")
+
+    def test_destroy_releases_pool_entry(self):
+        definition = text_definition("text", "text")
+        item = ReusableStyleItem.acquire(self.group, definition)
+        key = item._pool_key
+        self.assertIs(ReusableStyleItem._pool.get(key), item)
+        item.destroy()
+        self.assertNotIn(key, ReusableStyleItem._pool)
+        replacement = ReusableStyleItem.acquire(self.group, definition)
+        self.assertIsNot(replacement, item)
+        replacement.destroy()
+
+
+class LayoutGroupTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.studio = TestStudioApp.get_instance()
+        cls.pane = cls.studio.style_pane
+
+    def setUp(self) -> None:
+        # use a throwaway group, deselecting collapses it which would affect the shared app
+        self.layout_group = LayoutGroup(self.pane.body.body, self.pane)
+
+    def tearDown(self) -> None:
+        self.layout_group.destroy()
+
+    def test_widget_change_none(self):
+        self.layout_group.on_widget_change(None)
+        self.assertIsNone(self.layout_group._prev_layout)
+        self.assertEqual(self.layout_group.label, "Layout")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -81,6 +81,10 @@ class CollapseFrame(Frame):
         else:
             self.collapse()
 
+    @property
+    def is_expanded(self):
+        return not self._collapsed
+
     @property
     def label(self):
         return self._label["text"]